@@ -5,11 +5,31 @@ from .question_builders import (
     PythonQuestionBuilder,
 )
 
-from .jobs import stream, stream_async
+from .aggregation import reaggregate
+from .cache import JobCache
+from .comparison import ScoreComparison, compare_scores
+from .jobs import (
+    batch_records,
+    batch_records_async,
+    stream,
+    stream_async,
+    stream_batches,
+    stream_batches_async,
+)
+from .results import ScoringResults
 
 __all__ = [
+    "JobCache",
     "PiQuestionBuilder",
     "PythonQuestionBuilder",
+    "ScoreComparison",
+    "ScoringResults",
+    "batch_records",
+    "batch_records_async",
+    "compare_scores",
+    "reaggregate",
     "stream",
     "stream_async",
+    "stream_batches",
+    "stream_batches_async",
 ]
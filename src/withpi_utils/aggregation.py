@@ -0,0 +1,153 @@
+"""aggregation recomputes dimension and total scores locally under custom weights"""
+
+import warnings
+from typing import Callable, Literal, Mapping
+
+import numpy as np
+from withpi.types import Question
+
+from .results import ScoringResults
+
+# An aggregation takes (rows, columns) scores with NaN for missing values and
+# (columns,) weights, and returns one score per row.
+AggregateFn = Callable[[np.ndarray, np.ndarray], np.ndarray]
+Aggregate = Literal["mean", "min", "max", "geometric_mean"] | AggregateFn
+
+
+def reaggregate(
+    results: ScoringResults,
+    scoring_spec: list[Question] | None = None,
+    question_weights: Mapping[str, float] | None = None,
+    dimension_weights: Mapping[str, float] | None = None,
+    question_aggregate: Aggregate = "mean",
+    dimension_aggregate: Aggregate = "mean",
+) -> ScoringResults:
+    """reaggregate recomputes dimension and total scores from per-question scores.
+
+    The dimension structure comes from the subdimension scores in results.
+    Question weights default to the weights in scoring_spec, matched by label
+    or question text, and then to 1; question_weights overrides them by name.
+    Dimension weights default to 1. Results without dimension scores are
+    aggregated straight from their question scores into the total.
+
+    Nothing is re-scored: question and subdimension scores are returned as is."""
+    weights = weights_from_scoring_spec(scoring_spec or [])
+    weights.update(question_weights or {})
+    question_fn = _aggregate_fn(question_aggregate)
+    dimension_fn = _aggregate_fn(dimension_aggregate)
+
+    if not results.subdimension_names:
+        question_w = _weights(results.question_names, weights)
+        total_scores = question_fn(results.question_scores, question_w)
+        dimension_scores = results.dimension_scores
+    else:
+        subdimension_w = _weights(
+            [name for _, name in results.subdimension_names], weights
+        )
+        columns = {name: i for i, name in enumerate(results.dimension_names)}
+        groups: list[list[int]] = [[] for _ in results.dimension_names]
+        for i, (dimension_name, _) in enumerate(results.subdimension_names):
+            groups[columns[dimension_name]].append(i)
+        if question_aggregate == "mean":
+            dimension_scores = _grouped_mean(
+                results.subdimension_scores, subdimension_w, groups
+            )
+        else:
+            dimension_scores = np.full((len(results), len(groups)), np.nan)
+            for j, group in enumerate(groups):
+                if group:
+                    dimension_scores[:, j] = question_fn(
+                        results.subdimension_scores[:, group], subdimension_w[group]
+                    )
+        dimension_w = _weights(results.dimension_names, dimension_weights or {})
+        total_scores = dimension_fn(dimension_scores, dimension_w)
+
+    return ScoringResults(
+        total_scores=total_scores,
+        question_scores=results.question_scores,
+        question_names=results.question_names,
+        dimension_scores=dimension_scores,
+        dimension_names=results.dimension_names,
+        subdimension_scores=results.subdimension_scores,
+        subdimension_names=results.subdimension_names,
+    )
+
+
+def weights_from_scoring_spec(scoring_spec: list[Question]) -> dict[str, float]:
+    """Map each question's text and label to its weight, for questions that set one"""
+    weights: dict[str, float] = {}
+    for question in scoring_spec:
+        if question.weight is None:
+            continue
+        weights[question.question] = question.weight
+        if question.label:
+            weights[question.label] = question.weight
+    return weights
+
+
+def weighted_mean(scores: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted mean per row, ignoring missing scores"""
+    return _grouped_mean(scores, weights, [list(range(len(weights)))])[:, 0]
+
+
+def geometric_mean(scores: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted geometric mean per row, ignoring missing scores.
+
+    A row with a zero score under a positive weight has a geometric mean of 0."""
+    # Clamp zero-weight columns only, so that 0 * log(0) does not turn into NaN.
+    ignored = weights == 0
+    scores = np.where(ignored, np.maximum(scores, 1e-12), scores)
+    has_zero = ((scores == 0) & ~ignored).any(axis=1)
+    with np.errstate(divide="ignore"):
+        means = np.exp(weighted_mean(np.log(scores), weights))
+    return np.where(has_zero, 0.0, means)
+
+
+def minimum(scores: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Minimum per row over columns with non-zero weight, ignoring missing scores"""
+    return _nan_rows(np.nanmin, scores[:, weights != 0])
+
+
+def maximum(scores: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Maximum per row over columns with non-zero weight, ignoring missing scores"""
+    return _nan_rows(np.nanmax, scores[:, weights != 0])
+
+
+_AGGREGATES: dict[str, AggregateFn] = {
+    "mean": weighted_mean,
+    "min": minimum,
+    "max": maximum,
+    "geometric_mean": geometric_mean,
+}
+
+
+def _aggregate_fn(aggregate: Aggregate) -> AggregateFn:
+    if callable(aggregate):
+        return aggregate
+    if aggregate not in _AGGREGATES:
+        raise ValueError(f"Unknown aggregate: {aggregate}")
+    return _AGGREGATES[aggregate]
+
+
+def _weights(names: list[str], weights: Mapping[str, float]) -> np.ndarray:
+    return np.array([weights.get(name, 1.0) for name in names], dtype=np.float64)
+
+
+def _grouped_mean(
+    scores: np.ndarray, weights: np.ndarray, groups: list[list[int]]
+) -> np.ndarray:
+    """Weighted mean of each group of columns per row, as two matrix products"""
+    membership = np.zeros((scores.shape[1], len(groups)))
+    for j, group in enumerate(groups):
+        membership[group, j] = weights[group]
+    valid = ~np.isnan(scores)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (np.where(valid, scores, 0.0) @ membership) / (valid @ membership)
+
+
+def _nan_rows(fn, scores: np.ndarray) -> np.ndarray:
+    if scores.shape[1] == 0:
+        return np.full(scores.shape[0], np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return fn(scores, axis=1)
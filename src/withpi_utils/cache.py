@@ -0,0 +1,188 @@
+"""cache replays completed Pi jobs from disk instead of running them again"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, Literal
+
+from withpi._resource import AsyncAPIResource, SyncAPIResource  # type: ignore
+
+from .jobs import stream, stream_async
+
+CacheMode = Literal["readwrite", "replay", "refresh"]
+
+_DATA = "data.jsonl"
+_MESSAGES = "messages.txt"
+_STATE = "state.json"
+
+
+class JobCache:
+    """JobCache runs Pi jobs through start_job and stream, keeping their results on disk.
+
+    Entries are keyed by a hash of the resource and the start_job parameters,
+    and hold the streamed data, the status messages and the final job state.
+    Only jobs that finish in the DONE state are stored. Once the cache grows
+    past max_bytes the least recently used entries are evicted.
+
+    In "readwrite" mode hits are replayed and misses run the job. "replay"
+    never calls the API and raises KeyError on a miss, for offline tests.
+    "refresh" always runs the job and overwrites any stored entry."""
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        max_bytes: int = 1 << 30,
+        mode: CacheMode = "readwrite",
+    ):
+        if mode not in ("readwrite", "replay", "refresh"):
+            raise ValueError(f"Unknown cache mode: {mode}")
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.mode = mode
+
+    def run(self, resource: SyncAPIResource, **params: Any) -> Iterator[Any]:
+        """Start a job with params, or replay it from the cache, yielding its data like stream"""
+        entry = self._lookup(resource, params)
+        if entry is not None:
+            yield from _replay(entry)
+            return
+        status = resource.start_job(**params)  # type: ignore
+        with self._writer(resource, params) as writer:
+            for data in stream(resource, status, on_message=writer.message):
+                writer.data(data)
+                yield data
+            writer.commit(resource.retrieve(status.job_id))  # type: ignore
+
+    async def run_async(
+        self, resource: AsyncAPIResource, **params: Any
+    ) -> AsyncIterator[Any]:
+        """The async version of run"""
+        entry = self._lookup(resource, params)
+        if entry is not None:
+            for data in _replay(entry):
+                yield data
+            return
+        status = await resource.start_job(**params)  # type: ignore
+        with self._writer(resource, params) as writer:
+            async for data in stream_async(resource, status, on_message=writer.message):
+                writer.data(data)
+                yield data
+            writer.commit(await resource.retrieve(status.job_id))  # type: ignore
+
+    def state(
+        self, resource: SyncAPIResource | AsyncAPIResource, **params: Any
+    ) -> dict[str, Any] | None:
+        """Return the stored final job state for params, or None if it is not cached"""
+        path = self._path(resource, params) / _STATE
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def key(self, resource: SyncAPIResource | AsyncAPIResource, **params: Any) -> str:
+        """Return the cache key for a resource and its start_job parameters"""
+        # Sync and async resources share entries.
+        name = type(resource).__name__.removeprefix("Async")
+        canonical = json.dumps(
+            {"resource": f"{type(resource).__module__}.{name}", "params": params},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=_to_json,
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def clear(self) -> None:
+        """Remove every cached entry"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _path(self, resource, params: dict) -> Path:
+        return self.directory / self.key(resource, **params)
+
+    def _lookup(self, resource, params: dict) -> Path | None:
+        entry = self._path(resource, params)
+        if self.mode != "refresh" and (entry / _STATE).exists():
+            # Mark the entry as recently used. Replay caches are often
+            # read-only test fixtures, so they are left untouched.
+            if self.mode != "replay":
+                with contextlib.suppress(OSError):
+                    os.utime(entry)
+            return entry
+        if self.mode == "replay":
+            raise KeyError(f"No cached job for {type(resource).__name__} {params}")
+        return None
+
+    def _writer(self, resource, params: dict) -> "_EntryWriter":
+        return _EntryWriter(self, self._path(resource, params))
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for entry in self.directory.iterdir():
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            size = sum(f.stat().st_size for f in entry.iterdir())
+            entries.append((entry.stat().st_mtime, size, entry))
+            total += size
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+
+class _EntryWriter:
+    """Writes a cache entry to a temporary directory, moving it into place on commit"""
+
+    def __init__(self, cache: JobCache, entry: Path):
+        self.cache = cache
+        self.entry = entry
+
+    def __enter__(self) -> "_EntryWriter":
+        self.cache.directory.mkdir(parents=True, exist_ok=True)
+        self.tmp = Path(tempfile.mkdtemp(prefix=".tmp-", dir=self.cache.directory))
+        self.data_file = open(self.tmp / _DATA, "w", encoding="utf-8")
+        self.messages_file = open(self.tmp / _MESSAGES, "w", encoding="utf-8")
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.data_file.close()
+        self.messages_file.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def message(self, line: str) -> None:
+        print(line)
+        self.messages_file.write(line + "\n")
+
+    def data(self, data: Any) -> None:
+        self.data_file.write(json.dumps(data) + "\n")
+
+    def commit(self, state: Any) -> None:
+        state = _to_json(state)
+        if state.get("state") != "DONE":
+            return
+        self.data_file.close()
+        self.messages_file.close()
+        (self.tmp / _STATE).write_text(json.dumps(state))
+        shutil.rmtree(self.entry, ignore_errors=True)
+        os.replace(self.tmp, self.entry)
+        self.cache._evict()
+
+
+def _replay(entry: Path) -> Iterator[Any]:
+    with open(entry / _MESSAGES, "r", encoding="utf-8") as f:
+        for line in f:
+            print(line.rstrip("\n"))
+    with open(entry / _DATA, "r", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def _to_json(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
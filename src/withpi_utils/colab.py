@@ -1,11 +1,18 @@
+import codecs
 import httpx
+import io
+import itertools
 import json
+import os
 import markdown
 import numpy as np
 from IPython.display import HTML, display
 from matplotlib.colors import LinearSegmentedColormap
+from typing import IO, Any, Iterable, Iterator
 from withpi.types import Question, ScoringSystemMetrics
 
+_CHUNK_SIZE = 64 * 1024
+
 
 def load_scoring_spec_from_web(url: str) -> list[Question]:
     """load_scoring_spec_from_web pulls a scoring spec from a URL."""
@@ -16,15 +23,115 @@ def load_scoring_spec_from_web(url: str) -> list[Question]:
 def load_scoring_spec(
     scoring_spec: str | bytes | bytearray | list[dict],
 ) -> list[Question]:
-    if not isinstance(scoring_spec, dict):
-        parsed = json.loads(scoring_spec)  # type: ignore
-    else:
+    """load_scoring_spec parses a scoring spec from its JSON form."""
+    if isinstance(scoring_spec, list):
         parsed = scoring_spec
+    else:
+        parsed = json.loads(scoring_spec)
     if not isinstance(parsed, list):
         raise ValueError("Expected a list of questions")
     return [Question.model_validate(q) for q in parsed]
 
 
+def iter_scoring_spec(
+    scoring_spec: str | bytes | bytearray | list[dict] | IO | os.PathLike,
+    chunk_size: int = _CHUNK_SIZE,
+) -> Iterator[Question]:
+    """iter_scoring_spec lazily parses a scoring spec, validating each question as it is read.
+
+    Paths and file objects are read incrementally, so only the question
+    currently being parsed needs to be held in memory. This saves memory,
+    not time: every question is still validated, so reading a whole spec is
+    no faster than load_scoring_spec."""
+    if isinstance(scoring_spec, list):
+        for q in scoring_spec:
+            yield Question.model_validate(q)
+        return
+    if isinstance(scoring_spec, os.PathLike):
+        with open(scoring_spec, "r", encoding="utf-8") as f:
+            yield from iter_scoring_spec(f, chunk_size)
+        return
+    if isinstance(scoring_spec, (bytes, bytearray)):
+        scoring_spec = scoring_spec.decode(json.detect_encoding(scoring_spec))
+    if isinstance(scoring_spec, str):
+        questions = _iter_json_array(None, chunk_size, scoring_spec)
+    elif hasattr(scoring_spec, "read"):
+        questions = _iter_json_array(scoring_spec, chunk_size)
+    else:
+        raise ValueError("Expected a list of questions")
+    for q in questions:
+        yield Question.model_validate(q)
+
+
+def _iter_json_array(fp: IO | None, chunk_size: int, text: str = "") -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array in text, then read incrementally from fp."""
+    decoder = json.JSONDecoder()
+    # Binary file objects are decoded incrementally so multi-byte characters
+    # split across chunks survive.
+    bytes_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buf = text
+    pos = 0
+    eof = fp is None
+
+    def fill(size: int = chunk_size) -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = fp.read(size)  # type: ignore
+        while isinstance(chunk, (bytes, bytearray)):
+            raw = chunk
+            chunk = bytes_decoder.decode(raw, final=not raw)
+            if not chunk and raw:
+                chunk = fp.read(size)  # type: ignore
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_whitespace() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\n\r":
+                pos += 1
+            if pos < len(buf) or not fill():
+                return buf[pos] if pos < len(buf) else ""
+
+    if skip_whitespace() != "[":
+        raise ValueError("Expected a list of questions")
+    pos += 1
+    if skip_whitespace() == "]":
+        pos += 1
+    else:
+        while True:
+            # Each failed attempt re-decodes the value from its start, so the
+            # read size doubles to keep large questions linear overall.
+            read_size = chunk_size
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                    # A value ending exactly at the buffer edge may be truncated.
+                    if end < len(buf) or eof:
+                        break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                fill(read_size)
+                read_size *= 2
+            yield value
+            pos = end
+            delimiter = skip_whitespace()
+            pos += 1
+            if delimiter == "]":
+                break
+            if delimiter != ",":
+                raise ValueError("Malformed scoring spec: expected ',' or ']'")
+            skip_whitespace()
+    if skip_whitespace():
+        raise ValueError("Malformed scoring spec: trailing data after list")
+
+
 def dump_scoring_spec(scoring_spec: list[Question]) -> str:
     """dump_scoring_spec prints a scoring spec in JSON form, returning it to be saved in a file"""
     # Convert the list of Question objects to a list of dictionaries
@@ -34,6 +141,73 @@ def dump_scoring_spec(scoring_spec: list[Question]) -> str:
     return json.dumps(scoring_spec_dicts, indent=2)
 
 
+def write_scoring_spec(scoring_spec: Iterable[Question], fp: IO[str]) -> None:
+    """write_scoring_spec streams a scoring spec to a file in JSON form, one question at a time.
+
+    The output is identical to dump_scoring_spec."""
+    questions = iter(scoring_spec)
+    first = next(questions, None)
+    if first is None:
+        fp.write("[]")
+        return
+    encoder = json.JSONEncoder(indent=2)
+    dicts = (q.model_dump() for q in itertools.chain([first], questions))
+    for chunk in encoder.iterencode(_LazyList(dicts)):
+        fp.write(chunk)
+
+
+class _LazyList(list):
+    """A non-empty list whose items are pulled from an iterator as the JSON encoder walks it"""
+
+    def __init__(self, items: Iterator[Any]):
+        super().__init__()
+        self.items = items
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.items
+
+    def __bool__(self) -> bool:
+        return True
+
+
+def iter_scoring_spec_msgpack(
+    scoring_spec: bytes | bytearray | IO[bytes],
+) -> Iterator[Question]:
+    """iter_scoring_spec_msgpack lazily reads a scoring spec written by write_scoring_spec_msgpack.
+
+    Like iter_scoring_spec, this bounds memory rather than speeding up
+    loading. Requires the optional msgpack dependency."""
+    msgpack = _import_msgpack()
+    if isinstance(scoring_spec, (bytes, bytearray)):
+        scoring_spec = io.BytesIO(scoring_spec)
+    unpacker = msgpack.Unpacker(scoring_spec, raw=False)
+    for q in unpacker:
+        yield Question.model_validate(q)
+
+
+def write_scoring_spec_msgpack(scoring_spec: Iterable[Question], fp: IO[bytes]) -> None:
+    """write_scoring_spec_msgpack streams a scoring spec to a file in compact msgpack form.
+
+    Each question is written as a standalone msgpack map, so the spec can be
+    read back one question at a time with iter_scoring_spec_msgpack.
+    Requires the optional msgpack dependency."""
+    msgpack = _import_msgpack()
+    packer = msgpack.Packer(use_bin_type=True)
+    for question in scoring_spec:
+        fp.write(packer.pack(question.model_dump()))
+
+
+def _import_msgpack():
+    try:
+        import msgpack  # type: ignore
+    except ImportError as e:
+        raise ImportError(
+            "msgpack is required for the binary scoring spec format; "
+            "install it with `pip install withpi-utils[msgpack]`"
+        ) from e
+    return msgpack
+
+
 def display_scoring_spec(scoring_spec: list[Question]) -> None:
     """display_scoring_spec pretty-prints a scoring system in Colab using HTML"""
     html_content = "<div style='font-family: Arial, sans-serif;'>"
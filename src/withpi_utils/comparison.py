@@ -0,0 +1,132 @@
+"""comparison compares paired base and test scores with a vectorized bootstrap"""
+
+import warnings
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+from withpi.types import ScoringSystemMetrics
+
+from .results import ScoreKind, ScoringResults
+
+# Upper bound on the number of (resample, row) weights held in memory at once.
+_MAX_CHUNK_ELEMENTS = 1 << 22
+
+
+@dataclass
+class ScoreComparison:
+    """ScoreComparison holds per-column statistics of test minus base scores.
+
+    Every array has one entry per name. Rows where either side is missing a
+    score are left out of that column's statistics."""
+
+    names: list
+    count: np.ndarray
+    mean_delta: np.ndarray
+    ci_low: np.ndarray
+    ci_high: np.ndarray
+    win_rate: np.ndarray
+    tie_rate: np.ndarray
+    loss_rate: np.ndarray
+    bootstrap_means: np.ndarray
+
+
+def compare_scores(
+    base: ScoringResults | Iterable[ScoringSystemMetrics],
+    test: ScoringResults | Iterable[ScoringSystemMetrics],
+    kind: ScoreKind = "question",
+    n_resamples: int = 10000,
+    confidence: float = 0.95,
+    tie_tolerance: float = 0.0,
+    chunk_size: int | None = None,
+    seed: int | np.random.Generator | None = None,
+) -> ScoreComparison:
+    """compare_scores computes paired deltas, bootstrap confidence intervals and
+    win/tie/loss rates for test against base.
+
+    base and test must be aligned: row i of each scores the same example.
+    Columns are matched by name, keeping those present on both sides in base
+    order. Resampling is done chunk_size resamples at a time to bound memory."""
+    if not isinstance(base, ScoringResults):
+        base = ScoringResults.from_metrics(base)
+    if not isinstance(test, ScoringResults):
+        test = ScoringResults.from_metrics(test)
+    if len(base) != len(test):
+        raise ValueError(
+            f"base and test must be aligned, got {len(base)} and {len(test)} rows"
+        )
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    if n_resamples < 1:
+        raise ValueError("n_resamples must be at least 1")
+
+    test_index = {name: i for i, name in enumerate(test.names(kind))}
+    names = [name for name in base.names(kind) if name in test_index]
+    base_columns = [i for i, name in enumerate(base.names(kind)) if name in test_index]
+    test_columns = [test_index[name] for name in names]
+    deltas = (
+        np.asarray(test.scores(kind))[:, test_columns]
+        - np.asarray(base.scores(kind))[:, base_columns]
+    )
+
+    valid = ~np.isnan(deltas)
+    count = valid.sum(axis=0)
+    filled = np.where(valid, deltas, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_delta = filled.sum(axis=0) / count
+        win_rate = (deltas > tie_tolerance).sum(axis=0) / count
+        loss_rate = (deltas < -tie_tolerance).sum(axis=0) / count
+    tie_rate = np.where(count > 0, 1.0 - win_rate - loss_rate, np.nan)
+
+    bootstrap_means = _bootstrap_means(
+        filled, valid, n_resamples, chunk_size, np.random.default_rng(seed)
+    )
+    alpha = (1 - confidence) / 2
+    with warnings.catch_warnings():
+        # Columns without any paired scores have no interval.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        ci = np.nanquantile(bootstrap_means, [alpha, 1 - alpha], axis=0)
+    # NumPy drops the quantile axis when there are no columns.
+    ci_low, ci_high = ci.reshape(2, -1)
+
+    return ScoreComparison(
+        names=names,
+        count=count,
+        mean_delta=mean_delta,
+        ci_low=ci_low,
+        ci_high=ci_high,
+        win_rate=win_rate,
+        tie_rate=tie_rate,
+        loss_rate=loss_rate,
+        bootstrap_means=bootstrap_means,
+    )
+
+
+def _bootstrap_means(
+    filled: np.ndarray,
+    valid: np.ndarray,
+    n_resamples: int,
+    chunk_size: int | None,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Return (n_resamples, columns) column means over rows resampled with replacement.
+
+    Each resample is expressed as a vector of row counts, so a whole chunk of
+    resamples reduces to two matrix products."""
+    rows, columns = filled.shape
+    means = np.full((n_resamples, columns), np.nan)
+    if rows == 0 or columns == 0:
+        return means
+    if chunk_size is None:
+        chunk_size = max(1, _MAX_CHUNK_ELEMENTS // rows)
+    valid = valid.astype(np.float64)
+    for start in range(0, n_resamples, chunk_size):
+        stop = min(start + chunk_size, n_resamples)
+        size = stop - start
+        samples = rng.integers(0, rows, size=(size, rows))
+        samples += np.arange(size)[:, np.newaxis] * rows
+        weights = np.bincount(samples.ravel(), minlength=size * rows)
+        weights = weights.reshape(size, rows).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means[start:stop] = (weights @ filled) / (weights @ valid)
+    return means
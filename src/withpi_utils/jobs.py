@@ -3,7 +3,18 @@
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import json
-from typing import Protocol, Iterator, AsyncIterator, Any
+import threading
+import time
+from collections import deque
+from typing import (
+    Protocol,
+    Callable,
+    Iterable,
+    Iterator,
+    AsyncIterable,
+    AsyncIterator,
+    Any,
+)
 
 from withpi._resource import AsyncAPIResource, SyncAPIResource  # type: ignore
 
@@ -13,9 +24,13 @@ class StatusMessageProtocol(Protocol):
 
 
 def stream(
-    resource: SyncAPIResource, status: StatusMessageProtocol | str
+    resource: SyncAPIResource,
+    status: StatusMessageProtocol | str,
+    on_message: Callable[[str], None] = print,
 ) -> Iterator[dict[str, Any]]:
-    """stream streams data and prints messages given a status."""
+    """stream streams data and prints messages given a status.
+
+    Messages are passed to on_message, which prints them by default."""
     if isinstance(status, str):
         job_id = status
     else:
@@ -28,7 +43,7 @@ def stream(
                 job_id=job_id, timeout=None
             ) as response:
                 for line in response.iter_lines():
-                    print(line)
+                    on_message(line)
 
         future = executor.submit(stream_messages_thread)
 
@@ -45,9 +60,13 @@ def stream(
 
 
 async def stream_async(
-    resource: AsyncAPIResource, status: StatusMessageProtocol | str
+    resource: AsyncAPIResource,
+    status: StatusMessageProtocol | str,
+    on_message: Callable[[str], None] = print,
 ) -> AsyncIterator[dict[str, Any]]:
-    """stream streams data and prints messages given a status."""
+    """stream streams data and prints messages given a status.
+
+    Messages are passed to on_message, which prints them by default."""
     if isinstance(status, str):
         job_id = status
     else:
@@ -60,7 +79,7 @@ async def stream_async(
                 job_id=job_id, timeout=None
             ) as response:
                 async for line in response.iter_lines():
-                    print(line)
+                    on_message(line)
 
         tg.create_task(stream_messages_task())
 
@@ -73,3 +92,214 @@ async def stream_async(
                         yield json.loads(line)
                     except json.JSONDecodeError:
                         yield line
+
+
+Batch = list[Any] | dict[str, list[Any]]
+
+
+def stream_batches(
+    resource: SyncAPIResource,
+    status: StatusMessageProtocol | str,
+    batch_size: int = 1000,
+    max_wait: float | None = None,
+    columnar: bool = True,
+) -> Iterator[Batch]:
+    """stream_batches is like stream, but yields the data in batches.
+
+    See batch_records for the meaning of batch_size, max_wait and columnar."""
+    yield from batch_records(stream(resource, status), batch_size, max_wait, columnar)
+
+
+async def stream_batches_async(
+    resource: AsyncAPIResource,
+    status: StatusMessageProtocol | str,
+    batch_size: int = 1000,
+    max_wait: float | None = None,
+    columnar: bool = True,
+) -> AsyncIterator[Batch]:
+    """stream_batches_async is like stream_async, but yields the data in batches.
+
+    See batch_records for the meaning of batch_size, max_wait and columnar."""
+    async for batch in batch_records_async(
+        stream_async(resource, status), batch_size, max_wait, columnar
+    ):
+        yield batch
+
+
+def batch_records(
+    records: Iterable[Any],
+    batch_size: int = 1000,
+    max_wait: float | None = None,
+    columnar: bool = True,
+) -> Iterator[Batch]:
+    """batch_records groups records into batches of at most batch_size.
+
+    If max_wait is set, a batch is also yielded once that many seconds have
+    passed since its first record, even while the source is blocked waiting
+    for the next one. Records are then read on a background thread.
+    With columnar, each batch is a dict of column lists keyed by field name,
+    with None where a record lacks a field; otherwise it is a list of records."""
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    if max_wait is not None:
+        yield from _batch_records_timed(iter(records), batch_size, max_wait, columnar)
+        return
+    batch: list[Any] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield _to_batch(batch, columnar)
+            batch = []
+    if batch:
+        yield _to_batch(batch, columnar)
+
+
+def _batch_records_timed(
+    records: Iterator[Any], batch_size: int, max_wait: float, columnar: bool
+) -> Iterator[Batch]:
+    """Batch records read on a thread, so a partial batch is flushed on time."""
+    # The reader thread builds the batches itself; the consumer only wakes up
+    # to take a finished batch, or to take the partial one at its deadline.
+    lock = threading.Lock()
+    ready = threading.Condition(lock)
+    full: deque[list[Any]] = deque()
+    current: list[Any] = []
+    deadline = 0.0
+    done = False
+    stopped = False
+    error: BaseException | None = None
+
+    def read():
+        nonlocal current, deadline, done, error
+        try:
+            for record in records:
+                with lock:
+                    if stopped:
+                        return
+                    if not current:
+                        deadline = time.monotonic() + max_wait
+                        ready.notify_all()
+                    current.append(record)
+                    if len(current) >= batch_size or time.monotonic() >= deadline:
+                        full.append(current)
+                        current = []
+                        ready.notify_all()
+                        while len(full) > 1 and not stopped:
+                            ready.wait()
+        except BaseException as e:
+            error = e
+        with ready:
+            done = True
+            ready.notify_all()
+
+    # The reader stops at its next record once the consumer goes away.
+    threading.Thread(target=read, daemon=True).start()
+    try:
+        while True:
+            with ready:
+                ready.wait_for(lambda: full or current or done)
+                if not full and not done:
+                    ready.wait_for(
+                        lambda: full or done,
+                        timeout=max(0.0, deadline - time.monotonic()),
+                    )
+                if full:
+                    batch = full.popleft()
+                    ready.notify_all()
+                elif done and error is not None:
+                    raise error
+                elif current:
+                    batch, current = current, []
+                else:
+                    break
+            yield _to_batch(batch, columnar)
+    finally:
+        with ready:
+            stopped = True
+            ready.notify_all()
+
+
+async def batch_records_async(
+    records: AsyncIterable[Any],
+    batch_size: int = 1000,
+    max_wait: float | None = None,
+    columnar: bool = True,
+) -> AsyncIterator[Batch]:
+    """batch_records_async is the async version of batch_records."""
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    if max_wait is not None:
+        async for batch in _batch_records_timed_async(
+            records.__aiter__(), batch_size, max_wait, columnar
+        ):
+            yield batch
+        return
+    batch: list[Any] = []
+    async for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield _to_batch(batch, columnar)
+            batch = []
+    if batch:
+        yield _to_batch(batch, columnar)
+
+
+async def _batch_records_timed_async(
+    records: AsyncIterator[Any], batch_size: int, max_wait: float, columnar: bool
+) -> AsyncIterator[Batch]:
+    """Batch records awaited in a task, so a partial batch is flushed on time."""
+
+    async def next_record():
+        return await records.__anext__()
+
+    batch: list[Any] = []
+    deadline = 0.0
+    pending: asyncio.Task | None = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(next_record())
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            # Wait rather than cancel on timeout: cancelling __anext__ would
+            # abort the underlying stream.
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                yield _to_batch(batch, columnar)
+                batch = []
+                continue
+            task, pending = pending, None
+            try:
+                record = task.result()
+            except StopAsyncIteration:
+                break
+            if not batch:
+                deadline = time.monotonic() + max_wait
+            batch.append(record)
+            if len(batch) >= batch_size or time.monotonic() >= deadline:
+                yield _to_batch(batch, columnar)
+                batch = []
+        if batch:
+            yield _to_batch(batch, columnar)
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+def _to_batch(batch: list[Any], columnar: bool) -> Batch:
+    return _to_columns(batch) if columnar else batch
+
+
+def _to_columns(batch: list[Any]) -> dict[str, list[Any]]:
+    """Convert a list of dict records into column lists keyed by field name"""
+    columns: dict[str, list[Any]] = {}
+    for i, record in enumerate(batch):
+        if not isinstance(record, dict):
+            raise TypeError(
+                f"Cannot batch non-object record {record!r} into columns; use columnar=False"
+            )
+        for key, value in record.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * len(batch)
+            column[i] = value
+    return columns
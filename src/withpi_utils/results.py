@@ -0,0 +1,262 @@
+"""results packs many ScoringSystemMetrics into NumPy arrays for fast aggregation"""
+
+import os
+import warnings
+from pathlib import Path
+from typing import Iterable, Literal, Sequence
+
+import numpy as np
+from withpi.types import ScoringSystemMetrics
+
+ScoreKind = Literal["total", "question", "dimension", "subdimension"]
+
+# The arrays making up a ScoringResults, as stored on disk.
+_FIELDS = (
+    "total_scores",
+    "question_scores",
+    "question_names",
+    "dimension_scores",
+    "dimension_names",
+    "subdimension_scores",
+    "subdimension_names",
+)
+
+
+class ScoringResults:
+    """ScoringResults is a columnar store of many ScoringSystemMetrics.
+
+    Each result is a row. Questions, dimensions and (dimension, subdimension)
+    pairs are columns, indexed in order of first appearance. Scores missing
+    from a result are stored as NaN and ignored by the aggregates."""
+
+    def __init__(
+        self,
+        total_scores: np.ndarray,
+        question_scores: np.ndarray,
+        question_names: Sequence[str],
+        dimension_scores: np.ndarray,
+        dimension_names: Sequence[str],
+        subdimension_scores: np.ndarray,
+        subdimension_names: Sequence[tuple[str, str]],
+    ):
+        self.total_scores = total_scores
+        self.question_scores = question_scores
+        self.question_names = list(question_names)
+        self.dimension_scores = dimension_scores
+        self.dimension_names = list(dimension_names)
+        self.subdimension_scores = subdimension_scores
+        self.subdimension_names = [tuple(n) for n in subdimension_names]
+
+    @classmethod
+    def from_metrics(cls, metrics: Iterable[ScoringSystemMetrics]) -> "ScoringResults":
+        """Build a ScoringResults from ScoringSystemMetrics objects"""
+        totals: list[float] = []
+        questions = _ColumnBuilder()
+        dimensions = _ColumnBuilder()
+        subdimensions = _ColumnBuilder()
+        for row, m in enumerate(metrics):
+            totals.append(np.nan if m.total_score is None else m.total_score)
+            for name, score in (m.question_scores or {}).items():
+                questions.add(row, name, score)
+            for dimension_name, dimension in (m.dimension_scores or {}).items():
+                dimensions.add(row, dimension_name, dimension.total_score)
+                for name, score in dimension.subdimension_scores.items():
+                    subdimensions.add(row, (dimension_name, name), score)
+        n = len(totals)
+        return cls(
+            total_scores=np.array(totals, dtype=np.float64),
+            question_scores=questions.build(n),
+            question_names=questions.names(),
+            dimension_scores=dimensions.build(n),
+            dimension_names=dimensions.names(),
+            subdimension_scores=subdimensions.build(n),
+            subdimension_names=subdimensions.names(),
+        )
+
+    def __len__(self) -> int:
+        return len(self.total_scores)
+
+    def __getitem__(self, rows):
+        """Index rows: an int returns ScoringSystemMetrics, anything else a ScoringResults"""
+        if isinstance(rows, (int, np.integer)):
+            return self.to_metrics(int(rows))
+        return ScoringResults(
+            total_scores=self.total_scores[rows],
+            question_scores=self.question_scores[rows],
+            question_names=self.question_names,
+            dimension_scores=self.dimension_scores[rows],
+            dimension_names=self.dimension_names,
+            subdimension_scores=self.subdimension_scores[rows],
+            subdimension_names=self.subdimension_names,
+        )
+
+    def to_metrics(self, row: int) -> ScoringSystemMetrics:
+        """Rebuild the ScoringSystemMetrics for a single row.
+
+        Question and dimension scores are None when the row has none. A
+        dimension with subdimension scores but no total gets a NaN total."""
+        question_scores = _row_dict(self.question_names, self.question_scores[row])
+        dimension_scores = {
+            name: {"total_score": float(score), "subdimension_scores": {}}
+            for name, score in zip(self.dimension_names, self.dimension_scores[row])
+            if not np.isnan(score)
+        }
+        for (dimension_name, name), score in zip(
+            self.subdimension_names, self.subdimension_scores[row]
+        ):
+            if np.isnan(score):
+                continue
+            dimension = dimension_scores.setdefault(
+                dimension_name, {"total_score": np.nan, "subdimension_scores": {}}
+            )
+            dimension["subdimension_scores"][name] = float(score)
+        total_score = self.total_scores[row]
+        return ScoringSystemMetrics.model_validate(
+            {
+                "total_score": None if np.isnan(total_score) else float(total_score),
+                "question_scores": question_scores or None,
+                "dimension_scores": dimension_scores or None,
+            }
+        )
+
+    def scores(self, kind: ScoreKind = "question") -> np.ndarray:
+        """Return the (rows, columns) score array for a kind; total scores have one column"""
+        if kind == "total":
+            return self.total_scores[:, np.newaxis]
+        if kind == "question":
+            return self.question_scores
+        if kind == "dimension":
+            return self.dimension_scores
+        if kind == "subdimension":
+            return self.subdimension_scores
+        raise ValueError(f"Unknown score kind: {kind}")
+
+    def names(self, kind: ScoreKind = "question") -> list:
+        """Return the column names for a kind"""
+        if kind == "total":
+            return ["Total score"]
+        if kind == "question":
+            return self.question_names
+        if kind == "dimension":
+            return self.dimension_names
+        if kind == "subdimension":
+            return self.subdimension_names
+        raise ValueError(f"Unknown score kind: {kind}")
+
+    def mean(self, kind: ScoreKind = "question") -> np.ndarray:
+        """Per-column mean, ignoring missing scores"""
+        return _nan_reduce(np.nanmean, self.scores(kind))
+
+    def percentiles(
+        self, q: float | Sequence[float], kind: ScoreKind = "question"
+    ) -> np.ndarray:
+        """Per-column percentiles (0-100), shaped (len(q), columns), ignoring missing scores"""
+        return _nan_reduce(np.nanpercentile, self.scores(kind), q)
+
+    def histogram(
+        self,
+        kind: ScoreKind = "question",
+        bins: int = 10,
+        range: tuple[float, float] = (0.0, 1.0),
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Per-column histograms, returning (counts shaped (columns, bins), bin edges)"""
+        scores = self.scores(kind)
+        columns = scores.shape[1]
+        edges = np.linspace(range[0], range[1], bins + 1)
+        index = np.searchsorted(edges, scores, side="right") - 1
+        # The last bin is closed on the right, as with np.histogram.
+        index[scores == edges[-1]] = bins - 1
+        valid = (scores >= edges[0]) & (scores <= edges[-1])
+        flat = (np.arange(columns) * bins + index)[valid]
+        counts = np.bincount(flat, minlength=columns * bins)
+        return counts.reshape(columns, bins), edges
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Save to a .npz file, or to a directory of .npy files that can be memory-mapped"""
+        arrays = self._arrays()
+        path = Path(path)
+        if path.suffix == ".npz":
+            np.savez(path, **arrays)
+            return
+        path.mkdir(parents=True, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(path / f"{name}.npy", array)
+
+    @classmethod
+    def load(
+        cls, path: str | os.PathLike, mmap_mode: Literal["r", "r+", "c"] | None = None
+    ) -> "ScoringResults":
+        """Load a ScoringResults written by save; mmap_mode only applies to directories"""
+        path = Path(path)
+        if path.suffix == ".npz":
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in _FIELDS}
+        else:
+            arrays = {
+                name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode)
+                for name in _FIELDS
+            }
+        return cls(
+            total_scores=arrays["total_scores"],
+            question_scores=arrays["question_scores"],
+            question_names=arrays["question_names"].tolist(),
+            dimension_scores=arrays["dimension_scores"],
+            dimension_names=arrays["dimension_names"].tolist(),
+            subdimension_scores=arrays["subdimension_scores"],
+            subdimension_names=[
+                tuple(n) for n in arrays["subdimension_names"].tolist()
+            ],
+        )
+
+    def _arrays(self) -> dict[str, np.ndarray]:
+        return {
+            "total_scores": self.total_scores,
+            "question_scores": self.question_scores,
+            "question_names": np.array(self.question_names, dtype=np.str_),
+            "dimension_scores": self.dimension_scores,
+            "dimension_names": np.array(self.dimension_names, dtype=np.str_),
+            "subdimension_scores": self.subdimension_scores,
+            "subdimension_names": np.array(
+                self.subdimension_names, dtype=np.str_
+            ).reshape(-1, 2),
+        }
+
+
+class _ColumnBuilder:
+    """Collects sparse (row, column, score) entries, assigning column indexes by first appearance"""
+
+    def __init__(self):
+        self.index: dict = {}
+        self.rows: list[int] = []
+        self.columns: list[int] = []
+        self.values: list[float] = []
+
+    def add(self, row: int, name, score: float) -> None:
+        column = self.index.setdefault(name, len(self.index))
+        self.rows.append(row)
+        self.columns.append(column)
+        self.values.append(score)
+
+    def names(self) -> list:
+        return list(self.index)
+
+    def build(self, n: int) -> np.ndarray:
+        scores = np.full((n, len(self.index)), np.nan)
+        scores[self.rows, self.columns] = self.values
+        return scores
+
+
+def _row_dict(names: Sequence[str], row: np.ndarray) -> dict[str, float]:
+    return {
+        name: float(score) for name, score in zip(names, row) if not np.isnan(score)
+    }
+
+
+def _nan_reduce(fn, scores: np.ndarray, *args) -> np.ndarray:
+    """Apply a nan-aware reduction over rows, without warning on all-missing columns"""
+    if scores.shape[0] == 0:
+        shape = np.shape(np.asarray(args[0]))[:1] if args else ()
+        return np.full(shape + scores.shape[1:], np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return fn(scores, *args, axis=0)
@@ -0,0 +1,82 @@
+"""Synthetic fixtures shared by the offline benchmarks."""
+
+import random
+
+import pytest
+from withpi.types import Question, ScoringSystemMetrics
+
+from withpi_utils.colab import dump_scoring_spec
+
+# (questions, bytes of python_code per Python question). The last scales
+# spread 1 MB and 8 MB of code over a few questions, each far larger than
+# the chunk size used by the streaming parser.
+SCALES = [
+    (10, 0),
+    (1_000, 0),
+    (10_000, 0),
+    (8, 256 * 1024),
+    (8, 2 * 1024 * 1024),
+]
+
+PYTHON_CODE = """def score(response_text, input_text, **kwargs):
+    words = response_text.split()
+    return {'score': min(1.0, len(words) / 100.0), 'explanation': 'length'}
+"""
+
+
+def make_scoring_spec(size: int, code_size: int = 0) -> list[Question]:
+    python_code = PYTHON_CODE
+    if code_size > len(PYTHON_CODE):
+        padding = "    # padding\n" * ((code_size - len(PYTHON_CODE)) // 14)
+        python_code = PYTHON_CODE + padding
+    return [
+        Question(question=f"Is it good? ({i})")
+        if i % 2 == 0
+        else Question(
+            question=f"Python Code ({i})",
+            python_code=python_code,
+            scoring_type="PYTHON_CODE",
+        )
+        for i in range(size)
+    ]
+
+
+def make_metrics(
+    questions: int = 20, dimensions: int = 4, seed: int = 0
+) -> ScoringSystemMetrics:
+    rng = random.Random(seed)
+    question_scores = {f"Question {i}": rng.random() for i in range(questions)}
+    per_dimension = max(1, questions // dimensions)
+    dimension_scores = {}
+    for d in range(dimensions):
+        names = list(question_scores)[d * per_dimension : (d + 1) * per_dimension]
+        subdimension_scores = {name: question_scores[name] for name in names}
+        dimension_scores[f"Dimension {d}"] = {
+            "total_score": sum(subdimension_scores.values())
+            / max(1, len(subdimension_scores)),
+            "subdimension_scores": subdimension_scores,
+        }
+    return ScoringSystemMetrics.model_validate(
+        {
+            "total_score": sum(question_scores.values()) / questions,
+            "question_scores": question_scores,
+            "dimension_scores": dimension_scores,
+        }
+    )
+
+
+def _scale_id(scale: tuple[int, int]) -> str:
+    size, code_size = scale
+    if not code_size:
+        return f"{size}q"
+    return f"{size}q-{size // 2 * code_size // (1024 * 1024)}MB"
+
+
+@pytest.fixture(params=SCALES, ids=_scale_id)
+def scoring_spec(request) -> list[Question]:
+    return make_scoring_spec(*request.param)
+
+
+@pytest.fixture
+def scoring_spec_json(scoring_spec) -> str:
+    return dump_scoring_spec(scoring_spec)
@@ -0,0 +1,24 @@
+"""Benchmarks for Python question validation."""
+
+import pytest
+
+from withpi_utils import PythonQuestionBuilder
+
+from .conftest import PYTHON_CODE
+
+pytestmark = pytest.mark.benchmark(group="question_builders")
+
+
+@pytest.mark.parametrize("count", [1, 10], ids=lambda count: f"{count}q")
+def test_python_question_validation(benchmark, count):
+    def validate():
+        return [
+            PythonQuestionBuilder.from_python_string(
+                question=f"Python Code ({i})", python_code=PYTHON_CODE
+            )
+            for i in range(count)
+        ]
+
+    # Each validation spawns a subprocess, so keep the number of rounds low.
+    questions = benchmark.pedantic(validate, rounds=3, iterations=1)
+    assert len(questions) == count
@@ -0,0 +1,43 @@
+"""Benchmarks for HTML rendering of scores and responses."""
+
+import pytest
+
+from withpi_utils import colab
+
+from .conftest import make_metrics
+
+pytestmark = pytest.mark.benchmark(group="rendering")
+
+RESPONSE = "\n\n".join(
+    f"## Section {i}\n\nThis is **paragraph** {i} with a [link](https://withpi.ai)."
+    for i in range(50)
+)
+
+
+def test_score_to_color(benchmark):
+    scores = [i / 100 for i in range(101)]
+    colors = benchmark(lambda: [colab.score_to_color(score) for score in scores])
+    assert len(colors) == len(scores)
+
+
+@pytest.mark.parametrize("questions", [10, 100], ids=lambda n: f"{n}q")
+def test_print_scores(benchmark, questions):
+    metrics = make_metrics(questions=questions)
+    html = benchmark(colab.print_scores, metrics)
+    assert "Total score" in html
+
+
+def test_pretty_print_responses(benchmark, monkeypatch):
+    rendered = []
+    monkeypatch.setattr(colab, "display", rendered.append)
+    scores_left = make_metrics(seed=0)
+    scores_right = make_metrics(seed=1)
+    benchmark(
+        colab.pretty_print_responses,
+        RESPONSE,
+        RESPONSE,
+        header="Which is better?",
+        scores_left=scores_left,
+        scores_right=scores_right,
+    )
+    assert "Total score" in rendered[-1].data
@@ -0,0 +1,51 @@
+"""Benchmarks for scoring spec serialization."""
+
+import io
+
+import pytest
+
+from withpi_utils.colab import (
+    dump_scoring_spec,
+    iter_scoring_spec,
+    iter_scoring_spec_msgpack,
+    load_scoring_spec,
+    write_scoring_spec_msgpack,
+)
+
+pytestmark = pytest.mark.benchmark(group="spec_io")
+
+
+def test_load_scoring_spec(benchmark, scoring_spec, scoring_spec_json):
+    data = scoring_spec_json.encode()
+    loaded = benchmark(load_scoring_spec, data)
+    assert loaded == scoring_spec
+
+
+def test_iter_scoring_spec_file(benchmark, scoring_spec, scoring_spec_json):
+    data = scoring_spec_json.encode()
+    loaded = benchmark(lambda: list(iter_scoring_spec(io.BytesIO(data))))
+    assert loaded == scoring_spec
+
+
+def test_dump_scoring_spec(benchmark, scoring_spec, scoring_spec_json):
+    assert benchmark(dump_scoring_spec, scoring_spec) == scoring_spec_json
+
+
+def test_write_scoring_spec_msgpack(benchmark, scoring_spec):
+    pytest.importorskip("msgpack")
+
+    def write():
+        with io.BytesIO() as buf:
+            write_scoring_spec_msgpack(scoring_spec, buf)
+            return len(buf.getvalue())
+
+    assert benchmark(write) > 0
+
+
+def test_iter_scoring_spec_msgpack(benchmark, scoring_spec):
+    pytest.importorskip("msgpack")
+    with io.BytesIO() as buf:
+        write_scoring_spec_msgpack(scoring_spec, buf)
+        data = buf.getvalue()
+    loaded = benchmark(lambda: list(iter_scoring_spec_msgpack(io.BytesIO(data))))
+    assert loaded == scoring_spec
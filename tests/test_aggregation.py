@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from withpi.types import Question, ScoringSystemMetrics
+
+from withpi_utils import ScoringResults, reaggregate
+
+
+@pytest.fixture
+def results():
+    return ScoringResults.from_metrics(
+        [
+            ScoringSystemMetrics.model_validate(
+                {
+                    "total_score": 0.5,
+                    "question_scores": {"Is it good?": 0.2, "Is it short?": 0.8},
+                    "dimension_scores": {
+                        "Quality": {
+                            "total_score": 0.2,
+                            "subdimension_scores": {"Is it good?": 0.2},
+                        },
+                        "Style": {
+                            "total_score": 0.8,
+                            "subdimension_scores": {"Is it short?": 0.8},
+                        },
+                    },
+                }
+            ),
+            ScoringSystemMetrics.model_validate(
+                {
+                    "total_score": 0.5,
+                    "question_scores": {"Is it good?": 1.0, "Is it short?": 0.0},
+                    "dimension_scores": {
+                        "Quality": {
+                            "total_score": 1.0,
+                            "subdimension_scores": {"Is it good?": 1.0},
+                        },
+                        "Style": {
+                            "total_score": 0.0,
+                            "subdimension_scores": {"Is it short?": 0.0},
+                        },
+                    },
+                }
+            ),
+        ]
+    )
+
+
+def test_reaggregate_defaults_match(results):
+    reaggregated = reaggregate(results)
+    np.testing.assert_allclose(reaggregated.total_scores, results.total_scores)
+    np.testing.assert_allclose(reaggregated.dimension_scores, results.dimension_scores)
+    np.testing.assert_array_equal(reaggregated.question_scores, results.question_scores)
+
+
+def test_reaggregate_dimension_weights(results):
+    reaggregated = reaggregate(results, dimension_weights={"Quality": 3.0})
+    np.testing.assert_allclose(reaggregated.total_scores, [0.35, 0.75])
+
+
+def test_reaggregate_scoring_spec_weights(results):
+    # Drop the Style dimension by zero-weighting its only question.
+    scoring_spec = [
+        Question(question="Is it good?"),
+        Question(question="Is it short?", weight=0.0),
+    ]
+    reaggregated = reaggregate(results, scoring_spec=scoring_spec)
+    np.testing.assert_allclose(reaggregated.total_scores, [0.2, 1.0])
+
+
+def test_reaggregate_aggregates(results):
+    np.testing.assert_allclose(
+        reaggregate(results, dimension_aggregate="min").total_scores, [0.2, 0.0]
+    )
+    np.testing.assert_allclose(
+        reaggregate(
+            results, dimension_aggregate=lambda scores, weights: scores[:, 0]
+        ).total_scores,
+        [0.2, 1.0],
+    )
+    np.testing.assert_allclose(
+        reaggregate(results, dimension_aggregate="geometric_mean").total_scores,
+        [0.4, 0.0],
+    )
+    # A zero under zero weight is ignored rather than zeroing the row.
+    np.testing.assert_allclose(
+        reaggregate(
+            results,
+            dimension_weights={"Style": 0.0},
+            dimension_aggregate="geometric_mean",
+        ).total_scores,
+        [0.2, 1.0],
+    )
+
+
+def test_reaggregate_without_dimensions(results):
+    flat = ScoringResults(
+        total_scores=results.total_scores,
+        question_scores=results.question_scores,
+        question_names=results.question_names,
+        dimension_scores=np.empty((2, 0)),
+        dimension_names=[],
+        subdimension_scores=np.empty((2, 0)),
+        subdimension_names=[],
+    )
+    reaggregated = reaggregate(flat, question_weights={"Is it short?": 0.0})
+    np.testing.assert_allclose(reaggregated.total_scores, [0.2, 1.0])
+
+
+def test_reaggregate_unknown_aggregate(results):
+    with pytest.raises(ValueError, match=r"Unknown aggregate"):
+        reaggregate(results, question_aggregate="median")
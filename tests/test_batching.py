@@ -0,0 +1,119 @@
+"""test_batching exercises the batching utilities in jobs without the Pi API."""
+
+import asyncio
+import time
+
+import pytest
+
+from withpi_utils import batch_records, batch_records_async
+
+RECORDS = [
+    {"llm_input": "Vacuum Cleaner", "llm_output": "It cleans"},
+    {"llm_input": "Toaster", "llm_output": "It toasts"},
+    {"llm_input": "Kettle"},
+]
+
+
+def test_batch_records_columnar():
+    batches = list(batch_records(RECORDS, batch_size=2))
+    assert batches == [
+        {
+            "llm_input": ["Vacuum Cleaner", "Toaster"],
+            "llm_output": ["It cleans", "It toasts"],
+        },
+        {"llm_input": ["Kettle"]},
+    ]
+
+
+def test_batch_records_missing_field():
+    batches = list(batch_records(reversed(RECORDS), batch_size=3))
+    assert batches == [
+        {
+            "llm_input": ["Kettle", "Toaster", "Vacuum Cleaner"],
+            "llm_output": [None, "It toasts", "It cleans"],
+        }
+    ]
+
+
+def test_batch_records_rows():
+    batches = list(batch_records(RECORDS, batch_size=2, columnar=False))
+    assert batches == [RECORDS[:2], RECORDS[2:]]
+
+
+def test_batch_records_max_wait():
+    batches = list(batch_records(RECORDS, batch_size=10, max_wait=0, columnar=False))
+    assert batches == [[record] for record in RECORDS]
+
+
+def test_batch_records_max_wait_fills_batches():
+    batches = list(batch_records(range(25), batch_size=10, max_wait=60, columnar=False))
+    assert batches == [list(range(10)), list(range(10, 20)), list(range(20, 25))]
+
+
+def test_batch_records_max_wait_flushes_stalled_source():
+    def records():
+        yield from RECORDS[:2]
+        time.sleep(0.5)
+        yield RECORDS[2]
+
+    started = time.monotonic()
+    batches = batch_records(records(), batch_size=10, max_wait=0.05, columnar=False)
+    assert next(batches) == RECORDS[:2]
+    assert time.monotonic() - started < 0.4
+    assert list(batches) == [RECORDS[2:]]
+
+
+def test_batch_records_max_wait_raises_source_error():
+    def records():
+        yield RECORDS[0]
+        raise RuntimeError("stream failed")
+
+    with pytest.raises(RuntimeError, match=r"stream failed"):
+        list(batch_records(records(), batch_size=10, max_wait=1.0))
+
+
+def test_batch_records_non_object():
+    with pytest.raises(TypeError, match=r"use columnar=False"):
+        list(batch_records(["not json"]))
+
+
+@pytest.mark.asyncio
+async def test_batch_records_async():
+    async def records():
+        for record in RECORDS:
+            yield record
+
+    batches = [batch async for batch in batch_records_async(records(), batch_size=2)]
+    assert batches == list(batch_records(RECORDS, batch_size=2))
+
+
+@pytest.mark.asyncio
+async def test_batch_records_async_max_wait_flushes_stalled_source():
+    async def records():
+        for record in RECORDS[:2]:
+            yield record
+        await asyncio.sleep(0.5)
+        yield RECORDS[2]
+
+    started = time.monotonic()
+    batches = batch_records_async(
+        records(), batch_size=10, max_wait=0.05, columnar=False
+    )
+    assert await batches.__anext__() == RECORDS[:2]
+    assert time.monotonic() - started < 0.4
+    assert [batch async for batch in batches] == [RECORDS[2:]]
+
+
+@pytest.mark.asyncio
+async def test_batch_records_async_untimed_creates_no_tasks(monkeypatch):
+    async def records():
+        for record in RECORDS:
+            yield record
+
+    def no_tasks(*args, **kwargs):
+        raise AssertionError("untimed batching should not create tasks")
+
+    monkeypatch.setattr(asyncio, "ensure_future", no_tasks)
+    monkeypatch.setattr(asyncio, "create_task", no_tasks)
+    batches = [batch async for batch in batch_records_async(records(), batch_size=2)]
+    assert batches == list(batch_records(RECORDS, batch_size=2))
@@ -0,0 +1,182 @@
+"""test_cache exercises JobCache against a fake job resource."""
+
+import contextlib
+import io
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from withpi_utils import JobCache
+
+DATADIR = Path(__file__).resolve().parent / "data"
+
+
+class _Response:
+    def __init__(self, lines: list[str]):
+        self.lines = lines
+
+    def iter_lines(self):
+        yield from self.lines
+
+
+class FakeGenerateResource:
+    """Stands in for a Pi job resource, counting how many jobs it starts."""
+
+    def __init__(self, data: list[dict], state: str = "DONE"):
+        self.data = data
+        self.final_state = state
+        self.started = 0
+        self.with_streaming_response = SimpleNamespace(
+            stream_messages=lambda job_id, timeout: contextlib.nullcontext(
+                _Response([f"Job {job_id} {self.final_state}"])
+            ),
+            stream_data=lambda job_id, timeout: contextlib.nullcontext(
+                _Response([json.dumps(d) for d in self.data])
+            ),
+        )
+
+    def start_job(self, **params):
+        self.started += 1
+        return SimpleNamespace(job_id=f"job-{self.started}", state="QUEUED")
+
+    def retrieve(self, job_id):
+        return {"job_id": job_id, "state": self.final_state}
+
+
+class _AsyncResponse(_Response):
+    async def iter_lines(self):
+        for line in self.lines:
+            yield line
+
+
+class AsyncFakeGenerateResource(FakeGenerateResource):
+    """The async counterpart of FakeGenerateResource."""
+
+    def __init__(self, data: list[dict], state: str = "DONE"):
+        super().__init__(data, state)
+        self.with_streaming_response = SimpleNamespace(
+            stream_messages=lambda job_id, timeout: contextlib.nullcontext(
+                _AsyncResponse([f"Job {job_id} {self.final_state}"])
+            ),
+            stream_data=lambda job_id, timeout: contextlib.nullcontext(
+                _AsyncResponse([json.dumps(d) for d in self.data])
+            ),
+        )
+
+    async def start_job(self, **params):
+        return super().start_job(**params)
+
+    async def retrieve(self, job_id):
+        return super().retrieve(job_id)
+
+
+@pytest.fixture()
+def seed_request() -> dict:
+    return json.loads((DATADIR / "seed_request.json").read_bytes())
+
+
+@pytest.fixture()
+def data() -> list[dict]:
+    return [{"llm_input": f"Product {i}"} for i in range(5)]
+
+
+def _run(cache: JobCache, resource, params: dict) -> tuple[list, str]:
+    with io.StringIO() as buf, contextlib.redirect_stdout(buf):
+        results = list(cache.run(resource, **params))
+        return results, buf.getvalue()
+
+
+def test_cache_replays_completed_job(tmp_path, seed_request, data):
+    resource = FakeGenerateResource(data)
+    cache = JobCache(tmp_path)
+
+    first, printed = _run(cache, resource, seed_request)
+    second, replayed = _run(cache, resource, seed_request)
+    assert first == second == data
+    assert printed == replayed == "Job job-1 DONE\n"
+    assert resource.started == 1
+    assert cache.state(resource, **seed_request) == {"job_id": "job-1", "state": "DONE"}
+
+    _run(JobCache(tmp_path, mode="refresh"), resource, seed_request)
+    assert resource.started == 2
+
+
+def test_cache_key_is_canonical(tmp_path, seed_request):
+    cache = JobCache(tmp_path)
+    resource = FakeGenerateResource([])
+    reordered = dict(reversed(list(seed_request.items())))
+    assert cache.key(resource, **seed_request) == cache.key(resource, **reordered)
+    changed = {**seed_request, "num_inputs": seed_request.get("num_inputs", 0) + 1}
+    assert cache.key(resource, **seed_request) != cache.key(resource, **changed)
+
+
+def test_cache_skips_failed_jobs(tmp_path, seed_request, data):
+    resource = FakeGenerateResource(data, state="ERROR")
+    cache = JobCache(tmp_path)
+    _run(cache, resource, seed_request)
+    _run(cache, resource, seed_request)
+    assert resource.started == 2
+    assert cache.state(resource, **seed_request) is None
+
+
+def test_cache_replay_mode_does_not_touch_entries(
+    tmp_path, seed_request, data, monkeypatch
+):
+    resource = FakeGenerateResource(data)
+    _run(JobCache(tmp_path), resource, seed_request)
+
+    def read_only(*args, **kwargs):
+        raise PermissionError("read-only cache")
+
+    monkeypatch.setattr("os.utime", read_only)
+    replayed, _ = _run(JobCache(tmp_path, mode="replay"), resource, seed_request)
+    assert replayed == data
+    assert resource.started == 1
+
+
+def test_cache_replay_mode_miss(tmp_path, seed_request):
+    cache = JobCache(tmp_path, mode="replay")
+    with pytest.raises(KeyError, match=r"No cached job"):
+        _run(cache, FakeGenerateResource([]), seed_request)
+
+
+def test_cache_evicts_least_recently_used(tmp_path, data):
+    resource = FakeGenerateResource(data)
+    cache = JobCache(tmp_path)
+    _run(cache, resource, {"seed": 1})
+    size = sum(f.stat().st_size for f in tmp_path.rglob("*") if f.is_file())
+
+    cache = JobCache(tmp_path, max_bytes=size * 2)
+    _run(cache, resource, {"seed": 2})
+    _run(cache, resource, {"seed": 1})  # Mark seed 1 as recently used.
+    _run(cache, resource, {"seed": 3})
+    assert resource.started == 3
+    assert cache.state(resource, seed=1) is not None
+    assert cache.state(resource, seed=2) is None
+    assert cache.state(resource, seed=3) is not None
+
+
+async def _run_async(cache: JobCache, resource, params: dict) -> tuple[list, str]:
+    with io.StringIO() as buf, contextlib.redirect_stdout(buf):
+        results = [d async for d in cache.run_async(resource, **params)]
+        return results, buf.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_cache_run_async_miss_then_hit(tmp_path, seed_request, data):
+    resource = AsyncFakeGenerateResource(data)
+    cache = JobCache(tmp_path)
+
+    first, printed = await _run_async(cache, resource, seed_request)
+    second, replayed = await _run_async(cache, resource, seed_request)
+    assert first == second == data
+    assert printed == replayed == "Job job-1 DONE\n"
+    assert resource.started == 1
+    assert cache.state(resource, **seed_request) == {"job_id": "job-1", "state": "DONE"}
+
+    # Sync and async resources share entries.
+    sync_resource = FakeGenerateResource(data)
+    assert _run(cache, sync_resource, seed_request)[0] == data
+    assert sync_resource.started == 0
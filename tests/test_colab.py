@@ -1,6 +1,16 @@
+import io
+import json
 from pathlib import Path
 
-from withpi_utils.colab import load_scoring_spec, dump_scoring_spec
+import pytest
+from withpi_utils.colab import (
+    dump_scoring_spec,
+    iter_scoring_spec,
+    iter_scoring_spec_msgpack,
+    load_scoring_spec,
+    write_scoring_spec,
+    write_scoring_spec_msgpack,
+)
 from withpi.types import Question
 
 DATADIR = Path(__file__).resolve().parent / "data"
@@ -33,3 +43,84 @@ def test_load_scoring_spec():
             scoring_type="PYTHON_CODE",
         ),
     ]
+
+
+def test_load_scoring_spec_from_list():
+    path = DATADIR / "scoring_spec.json"
+    parsed = json.loads(path.read_bytes())
+    assert load_scoring_spec(parsed) == load_scoring_spec(path.read_bytes())
+
+
+def test_load_scoring_spec_not_a_list():
+    with pytest.raises(ValueError, match=r"Expected a list of questions"):
+        load_scoring_spec('{"question": "Is it good?"}')
+
+
+def test_iter_scoring_spec_streams_file():
+    path = DATADIR / "scoring_spec.json"
+    expected = load_scoring_spec(path.read_bytes())
+    # A tiny chunk size forces questions to span many reads.
+    with open(path, "rb") as f:
+        assert list(iter_scoring_spec(f, chunk_size=7)) == expected
+    with open(path, "r") as f:
+        assert list(iter_scoring_spec(f, chunk_size=7)) == expected
+    assert list(iter_scoring_spec(path)) == expected
+
+
+def test_iter_scoring_spec_large_question():
+    scoring_spec = [
+        Question(
+            question="Large Python Code",
+            python_code="x = 1\n" * 100_000,
+            scoring_type="PYTHON_CODE",
+        ),
+        Question(question="Is it good?"),
+    ]
+    data = dump_scoring_spec(scoring_spec).encode()
+    reads = []
+
+    class CountingReader(io.BytesIO):
+        def read(self, size=-1):
+            reads.append(size)
+            return super().read(size)
+
+    # The question is ~40,000 chunks long; reads must grow rather than
+    # re-decoding the question once per chunk.
+    chunk_size = 16
+    assert len(data) > 10_000 * chunk_size
+    loaded = list(iter_scoring_spec(CountingReader(data), chunk_size=chunk_size))
+    assert loaded == scoring_spec
+    assert len(reads) < 50
+    assert list(iter_scoring_spec(data.decode())) == scoring_spec
+
+
+def test_iter_scoring_spec_empty():
+    assert list(iter_scoring_spec(" [ ] ")) == []
+    assert dump_scoring_spec([]) == json.dumps([], indent=2)
+
+
+def test_iter_scoring_spec_malformed():
+    with pytest.raises(ValueError):
+        list(iter_scoring_spec('[{"question": "Is it good?"}'))
+    with pytest.raises(ValueError):
+        list(iter_scoring_spec('[{"question": "Is it good?"}] []'))
+
+
+def test_write_scoring_spec():
+    path = DATADIR / "scoring_spec.json"
+    scoring_spec = load_scoring_spec(path.read_bytes())
+    with io.StringIO() as buf:
+        write_scoring_spec(iter(scoring_spec), buf)
+        assert buf.getvalue() == path.read_text()
+
+
+def test_scoring_spec_msgpack_round_trip():
+    pytest.importorskip("msgpack")
+    path = DATADIR / "scoring_spec.json"
+    scoring_spec = load_scoring_spec(path.read_bytes())
+    with io.BytesIO() as buf:
+        write_scoring_spec_msgpack(scoring_spec, buf)
+        packed = buf.getvalue()
+    assert len(packed) < len(path.read_bytes())
+    assert list(iter_scoring_spec_msgpack(packed)) == scoring_spec
+    assert list(iter_scoring_spec_msgpack(io.BytesIO(packed))) == scoring_spec
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from withpi.types import ScoringSystemMetrics
+
+from withpi_utils import ScoringResults, compare_scores
+
+
+def _metrics(total_score: float, question_scores: dict[str, float]):
+    return ScoringSystemMetrics.model_validate(
+        {
+            "total_score": total_score,
+            "question_scores": question_scores,
+            "dimension_scores": {},
+        }
+    )
+
+
+@pytest.fixture
+def base():
+    return [
+        _metrics(0.5, {"Is it good?": 0.5, "Is it short?": 0.5}),
+        _metrics(0.5, {"Is it good?": 0.5, "Is it short?": 0.5}),
+        _metrics(0.5, {"Is it good?": 0.5, "Is it short?": 0.5}),
+        _metrics(0.5, {"Is it good?": 0.5}),
+    ]
+
+
+@pytest.fixture
+def test():
+    return [
+        _metrics(0.9, {"Is it good?": 0.9, "Is it short?": 0.5, "Is it new?": 1.0}),
+        _metrics(0.7, {"Is it good?": 0.7, "Is it short?": 0.5}),
+        _metrics(0.1, {"Is it good?": 0.1, "Is it short?": 0.5}),
+        _metrics(0.5, {"Is it good?": 0.5, "Is it short?": 1.0}),
+    ]
+
+
+def test_compare_scores(base, test):
+    comparison = compare_scores(base, test, n_resamples=200, seed=0)
+    assert comparison.names == ["Is it good?", "Is it short?"]
+    np.testing.assert_array_equal(comparison.count, [4, 3])
+    np.testing.assert_allclose(comparison.mean_delta, [0.05, 0.0], atol=1e-12)
+    np.testing.assert_allclose(comparison.win_rate, [0.5, 0.0])
+    np.testing.assert_allclose(comparison.tie_rate, [0.25, 1.0])
+    np.testing.assert_allclose(comparison.loss_rate, [0.25, 0.0])
+    assert comparison.bootstrap_means.shape == (200, 2)
+    assert np.all(comparison.ci_low <= comparison.mean_delta + 1e-12)
+    assert np.all(comparison.ci_high >= comparison.mean_delta - 1e-12)
+    np.testing.assert_allclose(comparison.ci_low[1], 0.0, atol=1e-12)
+    np.testing.assert_allclose(comparison.ci_high[1], 0.0, atol=1e-12)
+
+
+def test_compare_scores_chunked_total(base, test):
+    whole = compare_scores(base, test, kind="total", n_resamples=50, seed=1)
+    chunked = compare_scores(
+        ScoringResults.from_metrics(base),
+        ScoringResults.from_metrics(test),
+        kind="total",
+        n_resamples=50,
+        chunk_size=7,
+        seed=1,
+    )
+    assert whole.names == ["Total score"]
+    assert chunked.bootstrap_means.shape == (50, 1)
+    # Chunking must not change the resamples drawn for a given seed.
+    np.testing.assert_array_equal(whole.bootstrap_means, chunked.bootstrap_means)
+    np.testing.assert_array_equal(whole.ci_low, chunked.ci_low)
+    np.testing.assert_array_equal(whole.ci_high, chunked.ci_high)
+
+
+def test_compare_scores_misaligned(base, test):
+    with pytest.raises(ValueError, match=r"must be aligned"):
+        compare_scores(base, test[:2])
+
+
+def test_compare_scores_needs_resamples(base, test):
+    with pytest.raises(ValueError, match=r"n_resamples must be at least 1"):
+        compare_scores(base, test, n_resamples=0)
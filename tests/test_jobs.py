@@ -13,7 +13,7 @@ from withpi.types.data import (
 )
 from withpi.types.scoring_system import CalibrateStartJobParams
 
-from withpi_utils import stream, stream_async
+from withpi_utils import stream, stream_async, stream_batches
 
 DATADIR = Path(__file__).resolve().parent / "data"
 
@@ -136,6 +136,31 @@ async def test_synthetic_data_async(async_pi_client, synthetic_data_request):
     assert final_response.state == "DONE"
 
 
+def test_synthetic_data_batches_sync(pi_client, synthetic_data_request):
+    response = pi_client.data.generate_input_response_pairs.start_job(
+        **synthetic_data_request
+    )
+    assert response.state == "QUEUED"
+    print(f"Started job {response.job_id}")
+
+    batches = []
+    with io.StringIO() as buf, contextlib.redirect_stdout(buf):
+        for batch in stream_batches(
+            pi_client.data.generate_input_response_pairs, response, batch_size=2
+        ):
+            batches.append(batch)
+        printed = buf.getvalue()
+    for batch in batches:
+        print(f"Generated batch: {batch}")
+    print(printed)
+    assert len(batches) > 1
+    for batch in batches:
+        lengths = {len(column) for column in batch.values()}
+        assert len(lengths) == 1
+        assert lengths.pop() <= 2
+    assert "DONE" in printed
+
+
 def test_seeds_sync(pi_client, seed_request):
     response = pi_client.data.generate.start_job(**seed_request)
     assert response.state == "QUEUED"
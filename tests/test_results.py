@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+from withpi.types import ScoringSystemMetrics
+
+from withpi_utils import ScoringResults
+
+
+@pytest.fixture
+def metrics():
+    return [
+        ScoringSystemMetrics.model_validate(
+            {
+                "total_score": 0.5,
+                "question_scores": {"Is it good?": 0.2, "Is it short?": 0.8},
+                "dimension_scores": {
+                    "Quality": {
+                        "total_score": 0.5,
+                        "subdimension_scores": {
+                            "Is it good?": 0.2,
+                            "Is it short?": 0.8,
+                        },
+                    }
+                },
+            }
+        ),
+        ScoringSystemMetrics.model_validate(
+            {
+                "total_score": 1.0,
+                "question_scores": {"Is it good?": 1.0},
+                "dimension_scores": {
+                    "Quality": {
+                        "total_score": 1.0,
+                        "subdimension_scores": {"Is it good?": 1.0},
+                    }
+                },
+            }
+        ),
+    ]
+
+
+def test_from_metrics(metrics):
+    results = ScoringResults.from_metrics(metrics)
+    assert len(results) == 2
+    assert results.question_names == ["Is it good?", "Is it short?"]
+    assert results.dimension_names == ["Quality"]
+    assert results.subdimension_names == [
+        ("Quality", "Is it good?"),
+        ("Quality", "Is it short?"),
+    ]
+    np.testing.assert_array_equal(results.total_scores, [0.5, 1.0])
+    np.testing.assert_array_equal(results.question_scores, [[0.2, 0.8], [1.0, np.nan]])
+
+
+def test_round_trip_metrics(metrics):
+    results = ScoringResults.from_metrics(metrics)
+    assert results[0] == metrics[0]
+    assert results[1] == metrics[1]
+    assert len(results[1:]) == 1
+    assert results[np.array([False, True])][0] == metrics[1]
+
+
+def test_round_trip_metrics_without_dimensions():
+    metrics = ScoringSystemMetrics(total_score=0.5, question_scores={"a": 0.5})
+    results = ScoringResults.from_metrics([metrics, ScoringSystemMetrics()])
+    assert results[0] == metrics
+    assert results[1] == ScoringSystemMetrics()
+
+
+def test_to_metrics_keeps_subdimensions_without_dimension_total(metrics):
+    results = ScoringResults.from_metrics(metrics)
+    results.dimension_scores[0, 0] = np.nan
+    dimension = results[0].dimension_scores["Quality"]
+    assert np.isnan(dimension.total_score)
+    assert dimension.subdimension_scores == {"Is it good?": 0.2, "Is it short?": 0.8}
+
+
+def test_aggregates(metrics):
+    results = ScoringResults.from_metrics(metrics)
+    np.testing.assert_allclose(results.mean(), [0.6, 0.8])
+    np.testing.assert_allclose(results.mean("total"), [0.75])
+    np.testing.assert_allclose(
+        results.percentiles([0, 100], "dimension"), [[0.5], [1.0]]
+    )
+    counts, edges = results.histogram("subdimension", bins=4)
+    assert len(edges) == 5
+    np.testing.assert_array_equal(counts, [[1, 0, 0, 1], [0, 0, 0, 1]])
+
+
+@pytest.mark.parametrize("name", ["results.npz", "results"])
+def test_save_load(tmp_path, metrics, name):
+    results = ScoringResults.from_metrics(metrics)
+    results.save(tmp_path / name)
+    mmap_mode = None if name.endswith(".npz") else "r"
+    loaded = ScoringResults.load(tmp_path / name, mmap_mode=mmap_mode)
+    assert loaded.question_names == results.question_names
+    assert loaded.subdimension_names == results.subdimension_names
+    np.testing.assert_array_equal(loaded.question_scores, results.question_scores)
+    assert loaded[0] == metrics[0]